@@ -0,0 +1,38 @@
+"""
+Process-wide AsyncOpenAI client shared by the mapping and tagging agents.
+"""
+import os
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+# Connection pool size - the httpx default of 100 caps concurrent requests
+# well below the OpenAI tier limits, so run_batch_async would plateau there
+XBRL_MAX_CONNS = int(os.environ.get("XBRL_MAX_CONNS", "2000"))
+
+_client: Optional[AsyncOpenAI] = None
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Return the process-wide AsyncOpenAI client, creating it on first use.
+
+    Both agents share one high-limit httpx pool, so pipelines that call
+    mapping and tagging per filing reuse the same keepalive connections
+    instead of paying duplicate TLS handshakes for two separate pools.
+    AsyncOpenAI is task-safe, so sharing the singleton under asyncio is safe.
+    """
+    global _client
+    if _client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=XBRL_MAX_CONNS,
+                max_keepalive_connections=int(XBRL_MAX_CONNS * 0.75)
+            ),
+            timeout=httpx.Timeout(120.0)
+        )
+        _client = AsyncOpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY", ""),
+            http_client=http_client
+        )
+    return _client
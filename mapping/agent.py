@@ -1,25 +1,27 @@
 """
 Financial statement mapping agent implementation.
 """
+from typing import Any, List
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIModel
-import os
+import asyncio
+
+from core.openai_client import get_async_openai_client
 
 from .models import PartialXBRL
 from .dependencies import FinancialTermDeps, financial_deps
+from .ratelimit import call_with_backoff
 from .system_prompts import FINANCIAL_STATEMENT_PROMPT
 from .tools import (
-    match_financial_term as mft,
-    extract_and_categorize_financial_data as ecfd,
-    MatchTermContext, 
+    match_financial_term_async as _mft,
+    extract_and_categorize_financial_data_async as _ecfd,
+    MatchTermContext,
     ExtractContext
 )
 
-# Get OpenAI API key from environment
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
-
-# Initialize the OpenAI model
-mapping_model = OpenAIModel(model_name="gpt-4o", api_key=OPENAI_API_KEY)
+# Initialize the OpenAI model on the process-wide shared client so both
+# agents draw from one high-limit connection pool
+mapping_model = OpenAIModel("gpt-4o", openai_client=get_async_openai_client())
 
 # Define the agent with dependencies
 financial_statement_agent = Agent(
@@ -30,11 +32,89 @@ financial_statement_agent = Agent(
     retries=5
 )
 
-# Register tools with the agent
+# Register tools with the agent - async so tool calls don't block the event
+# loop while other filings' agent runs are in flight
 @financial_statement_agent.tool
-def match_financial_term(context, term, statement_type="all"):
-    return mft(context, term, statement_type)
+async def match_financial_term(context, term, statement_type="all"):
+    return await _mft(context, term, statement_type)
 
 @financial_statement_agent.tool
-def extract_and_categorize_financial_data(context, data, field_path=""):
-    return ecfd(context, data, field_path)
\ No newline at end of file
+async def extract_and_categorize_financial_data(context, data, field_path=""):
+    return await _ecfd(context, data, field_path)
+
+async def run_batch_async(inputs: List[str], *, max_concurrency: int = 32) -> List[Any]:
+    """
+    Run the mapping agent over many inputs concurrently.
+
+    Each call to the agent is I/O-bound on the OpenAI API, so fanning out
+    with asyncio.gather gives near-linear throughput up to max_concurrency.
+
+    Args:
+        inputs: List of prompt strings, one per financial statement
+        max_concurrency: Maximum number of in-flight agent calls
+
+    Returns:
+        List of agent results in input order; failed calls are returned
+        as exception instances instead of raising
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(prompt: str):
+        async with semaphore:
+            # Paced by the shared token bucket with jittered backoff so a
+            # 429 doesn't storm every worker into simultaneous retries
+            return await call_with_backoff(
+                financial_statement_agent.run, prompt, deps=financial_deps
+            )
+
+    tasks = [_bounded(prompt) for prompt in inputs]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+def run_batch(inputs: List[str], *, max_concurrency: int = 32) -> List[Any]:
+    """
+    Synchronous wrapper around run_batch_async for scripts and notebooks.
+
+    Args:
+        inputs: List of prompt strings, one per financial statement
+        max_concurrency: Maximum number of in-flight agent calls
+
+    Returns:
+        List of agent results in input order
+    """
+    return asyncio.run(run_batch_async(inputs, max_concurrency=max_concurrency))
+
+async def run_batch_async_grouped(inputs: List[str], *, target_tokens: int = 200_000,
+                                  max_concurrency: int = 32) -> List[Any]:
+    """
+    Run the mapping agent over many inputs, grouped by approximate size.
+
+    Buckets of similar-length prompts go through the bounded pool one after
+    another, so the in-flight set is always homogeneous in size and one very
+    large filing no longer stalls a slot that could be serving dozens of
+    small ones (head-of-line blocking).
+
+    Args:
+        inputs: List of prompt strings, one per financial statement
+        target_tokens: Approximate summed token budget per bucket
+        max_concurrency: Maximum in-flight agent calls across the whole run
+
+    Returns:
+        List of agent results in input order; failed calls are returned
+        as exception instances instead of raising
+    """
+    from .batch import bucket_by_length
+
+    buckets = bucket_by_length(inputs, target_tokens=target_tokens)
+    results: List[Any] = [None] * len(inputs)
+
+    # Sequential buckets keep total concurrency at max_concurrency; running
+    # them concurrently would multiply the cap by the bucket count and mix
+    # sizes back together, defeating the grouping
+    for bucket in buckets:
+        bucket_results = await run_batch_async(
+            [inputs[i] for i in bucket], max_concurrency=max_concurrency
+        )
+        for i, result in zip(bucket, bucket_results):
+            results[i] = result
+
+    return results
\ No newline at end of file
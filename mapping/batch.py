@@ -0,0 +1,221 @@
+"""
+Opt-in OpenAI Batch API backend for the mapping and tagging agents.
+
+For offline workloads (e.g. re-tagging historical filings) the /v1/batches
+endpoint gives a 50% token cost reduction and much higher sustained
+throughput than the real-time /v1/chat/completions path, at the cost of
+latency (results arrive within the completion window instead of seconds).
+"""
+import io
+import json
+import os
+import time
+import logging
+from typing import Any, Dict, List, Optional, Type
+
+from openai import OpenAI
+from pydantic import BaseModel
+
+from .models import PartialXBRL
+from .system_prompts import FINANCIAL_STATEMENT_PROMPT
+from tagging.models import PartialXBRLWithTags
+from tagging.system_prompts import XBRL_DATA_TAGGING_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# How often to poll the batch job status, in seconds
+DEFAULT_POLL_INTERVAL = 30
+
+# Default summed-token budget per scheduling bucket
+DEFAULT_BUCKET_TOKENS = 200_000
+
+def estimate_tokens(payload: Any) -> int:
+    """
+    Approximate the token count of a payload (~4 characters per token,
+    which is close enough for JSON-heavy financial statement prompts).
+    """
+    if not isinstance(payload, str):
+        payload = json.dumps(payload)
+    return len(payload) // 4
+
+def bucket_by_length(inputs: List[Any], target_tokens: int = DEFAULT_BUCKET_TOKENS) -> List[List[int]]:
+    """
+    Group inputs into similar-sized buckets for concurrent scheduling.
+
+    Variable-length filings cause head-of-line blocking when mixed in one
+    concurrency pool - a single huge filing stalls a slot that could serve
+    many small ones. Sorting by approximate token count and greedily packing
+    buckets up to a summed-token target keeps each bucket homogeneous.
+
+    Args:
+        inputs: The raw inputs (strings or JSON-serializable structures)
+        target_tokens: Approximate summed token budget per bucket
+
+    Returns:
+        List of buckets, each a list of indices into inputs
+    """
+    indexed = sorted(range(len(inputs)), key=lambda i: estimate_tokens(inputs[i]))
+
+    buckets: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i in indexed:
+        tokens = estimate_tokens(inputs[i])
+        if current and current_tokens + tokens > target_tokens:
+            buckets.append(current)
+            current = []
+            current_tokens = 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        buckets.append(current)
+
+    return buckets
+
+class BatchBackend:
+    """
+    Runs agent-style requests through OpenAI's Batch API.
+
+    The backend serializes each invocation to a JSONL line in the format
+    the Batch API expects, uploads the file, creates the job, polls until
+    completion, and re-injects the responses into the same Pydantic result
+    models the live agents produce.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, model_name: str = "gpt-4o",
+                 completion_window: str = "24h", poll_interval: int = DEFAULT_POLL_INTERVAL):
+        self.client = OpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY", ""))
+        self.model_name = model_name
+        self.completion_window = completion_window
+        self.poll_interval = poll_interval
+
+    def _build_request_line(self, custom_id: str, system_prompt: str, user_prompt: str,
+                            result_type: Type[BaseModel]) -> Dict[str, Any]:
+        """
+        Build one Batch API request entry matching the live chat-completions body.
+
+        The live agents enforce structure through pydantic_ai's schema
+        machinery; the batch body replicates that with a json_schema
+        response_format built from the result model, so responses have to
+        conform to the same strict model (extra=\"forbid\", field formats)
+        before model_validate_json ever sees them.
+        """
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model_name,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": (
+                            f"{system_prompt}\n\n"
+                            f"Respond with a single JSON object matching the "
+                            f"{result_type.__name__} schema enforced by the response format."
+                        )
+                    },
+                    {"role": "user", "content": user_prompt}
+                ],
+                "response_format": {
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": result_type.__name__,
+                        "schema": result_type.model_json_schema()
+                    }
+                }
+            }
+        }
+
+    def _upload_requests(self, request_lines: List[Dict[str, Any]]) -> str:
+        """Serialize requests to JSONL and upload them as a batch input file"""
+        jsonl_payload = "\n".join(json.dumps(line) for line in request_lines)
+        batch_file = self.client.files.create(
+            file=io.BytesIO(jsonl_payload.encode("utf-8")),
+            purpose="batch"
+        )
+        logger.info(f"Uploaded batch input file {batch_file.id} with {len(request_lines)} requests")
+        return batch_file.id
+
+    def _wait_for_completion(self, batch_id: str) -> Any:
+        """Poll the batch job until it reaches a terminal state"""
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                return batch
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+            logger.debug(f"Batch {batch_id} status: {batch.status}")
+            time.sleep(self.poll_interval)
+
+    def _collect_results(self, batch: Any, result_type: Type[BaseModel]) -> Dict[str, Any]:
+        """
+        Download the batch output file and validate each response into the
+        agent's result model. Lines that fail validation are kept as the
+        raised exception so callers can inspect partial failures.
+        """
+        output_text = self.client.files.content(batch.output_file_id).text
+        results: Dict[str, Any] = {}
+
+        for line in output_text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            custom_id = entry.get("custom_id", "")
+            try:
+                content = entry["response"]["body"]["choices"][0]["message"]["content"]
+                results[custom_id] = result_type.model_validate_json(content)
+            except Exception as e:
+                logger.warning(f"Failed to parse batch response for {custom_id}: {str(e)}")
+                results[custom_id] = e
+
+        return results
+
+    def _run(self, inputs: List[str], system_prompt: str, result_type: Type[BaseModel]) -> List[Any]:
+        """Shared submit/poll/collect flow for both agents"""
+        request_lines = [
+            self._build_request_line(f"request-{i}", system_prompt, user_prompt, result_type)
+            for i, user_prompt in enumerate(inputs)
+        ]
+
+        input_file_id = self._upload_requests(request_lines)
+        batch = self.client.batches.create(
+            input_file_id=input_file_id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window
+        )
+        logger.info(f"Created batch job {batch.id}")
+
+        completed = self._wait_for_completion(batch.id)
+        results = self._collect_results(completed, result_type)
+
+        # Return results in input order
+        return [results.get(f"request-{i}") for i in range(len(inputs))]
+
+    def run_mapping_batch(self, inputs: List[str]) -> List[Any]:
+        """
+        Map many financial statements through the Batch API.
+
+        Args:
+            inputs: List of user prompts, one per financial statement
+
+        Returns:
+            List of PartialXBRL results in input order; entries that failed
+            validation are returned as exception instances
+        """
+        return self._run(inputs, FINANCIAL_STATEMENT_PROMPT, PartialXBRL)
+
+    def run_tagging_batch(self, inputs: List[str]) -> List[Any]:
+        """
+        Tag many mapped financial statements through the Batch API.
+
+        Args:
+            inputs: List of user prompts, one per mapped financial statement
+
+        Returns:
+            List of PartialXBRLWithTags results in input order; entries that
+            failed validation are returned as exception instances
+        """
+        return self._run(inputs, XBRL_DATA_TAGGING_PROMPT, PartialXBRLWithTags)
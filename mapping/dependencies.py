@@ -1,15 +1,21 @@
 """
 Dependencies for the financial statement mapping agent.
 """
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
 
 @dataclass
 class FinancialTermDeps:
     """Dependencies for financial term mapping"""
     income_statement_terms: Dict[str, List[str]]
     financial_position_terms: Dict[str, List[str]]
-    
+
+    # Flattened (full_field, keywords) rows, prebuilt once so the matcher
+    # iterates a compact list instead of rebuilding a filtered dict per call
+    income_items: List[Tuple[str, Tuple[str, ...]]] = field(init=False, default_factory=list)
+    position_items: List[Tuple[str, Tuple[str, ...]]] = field(init=False, default_factory=list)
+    all_items: List[Tuple[str, Tuple[str, ...]]] = field(init=False, default_factory=list)
+
     def __post_init__(self):
         """Ensure all terms are lowercase for case-insensitive matching"""
         self.income_statement_terms = {
@@ -18,6 +24,13 @@ class FinancialTermDeps:
         self.financial_position_terms = {
             k: [t.lower() for t in terms] for k, terms in self.financial_position_terms.items()
         }
+        self.income_items = [
+            (f"income.{k}", tuple(terms)) for k, terms in self.income_statement_terms.items()
+        ]
+        self.position_items = [
+            (f"position.{k}", tuple(terms)) for k, terms in self.financial_position_terms.items()
+        ]
+        self.all_items = self.income_items + self.position_items
 
 # Create term mappings
 position_terms = {
@@ -0,0 +1,93 @@
+"""
+Shared rate limiting and retry helpers for concurrent agent calls.
+
+Each agent call retries independently, so under high-concurrency batches a
+single 429 would otherwise storm every worker into simultaneous retries.
+One process-wide token bucket paces all coroutines together, and the retry
+helper backs off exponentially with jitter so workers don't re-collide.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, Optional
+
+from openai import APIConnectionError, APITimeoutError, RateLimitError
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying - everything else propagates immediately
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError)
+
+# Sustained request rate shared across all concurrent agent calls; tune to
+# just under the OpenAI tier RPM limit
+XBRL_RATE_PER_MINUTE = int(os.environ.get("XBRL_RATE_PER_MINUTE", "500"))
+
+class AsyncTokenBucket:
+    """
+    Token bucket for pacing concurrent coroutines.
+
+    The bucket refills continuously at rate_per_minute and allows bursts up
+    to the configured size, so short spikes go through immediately while the
+    sustained rate stays below the API tier limit.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then consume it"""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated_at) * self.rate_per_second
+                )
+                self.updated_at = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate_per_second
+            await asyncio.sleep(wait)
+
+# One bucket per process so every batch worker shares the same pacing
+shared_bucket = AsyncTokenBucket(XBRL_RATE_PER_MINUTE, burst=max(XBRL_RATE_PER_MINUTE // 10, 1))
+
+async def call_with_backoff(func, *args: Any, bucket: Optional[AsyncTokenBucket] = None,
+                            max_attempts: int = 6, max_wait: float = 60.0, **kwargs: Any) -> Any:
+    """
+    Await an LLM-bound coroutine function with pacing and jittered backoff.
+
+    Args:
+        func: Coroutine function to call (e.g. an agent's run method)
+        *args: Positional arguments forwarded to func
+        bucket: Token bucket to pace against; defaults to the shared bucket
+        max_attempts: Total attempts before the last error propagates
+        max_wait: Cap on a single backoff sleep, in seconds
+        **kwargs: Keyword arguments forwarded to func
+
+    Returns:
+        Whatever func returns
+    """
+    bucket = bucket or shared_bucket
+
+    for attempt in range(max_attempts):
+        await bucket.acquire()
+        try:
+            return await func(*args, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_attempts - 1:
+                raise
+            # Exponential backoff with jitter so retries don't re-collide
+            wait = min(max_wait, (2 ** attempt) * random.uniform(0.5, 1.5))
+            logger.warning(
+                f"Retryable API error ({type(e).__name__}), attempt {attempt + 1}/{max_attempts}, "
+                f"backing off {wait:.1f}s"
+            )
+            await asyncio.sleep(wait)
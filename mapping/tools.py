@@ -2,10 +2,12 @@
 Tools for the financial statement mapping agent.
 """
 from typing import Dict, Any, List, Union
+import asyncio
+import functools
 from pydantic import BaseModel, Field
 from pydantic_ai import RunContext
 
-from .dependencies import FinancialTermDeps
+from .dependencies import FinancialTermDeps, financial_deps
 
 class MatchTermContext(BaseModel):
     """Context for the term matching tool"""
@@ -24,49 +26,24 @@ class ExtractContext(BaseModel):
     """Context for the extraction tool"""
     pass
 
-def match_financial_term(context: RunContext[FinancialTermDeps], term: str, statement_type: str = "all") -> Dict[str, Any]:
+def _match_term_impl(deps: FinancialTermDeps, term_lower: str, statement_type: str) -> Dict[str, Any]:
     """
-    Match a financial term to the standardized field name in financial statements.
-    Uses injected financial term mappings from dependencies.
-    
-    Args:
-        context: The tool context with injected dependencies
-        term: The financial term to match (e.g., "Revenue", "Staff Costs", "Cash and bank", etc.)
-        statement_type: Type of statement to match against ("income", "position", "all")
-        
-    Returns:
-        Dictionary with matching field name, statement type, and confidence level
+    Core term matcher. Operates on normalized (lowercased) inputs so results
+    can be cached by (term, statement_type), and scans the prebuilt flat
+    item rows instead of rebuilding a filtered mapping dict per call.
     """
-    term_lower = term.lower().strip()
-    
-    # Get mappings from dependencies
-    income_mappings = context.deps.income_statement_terms
-    position_mappings = context.deps.financial_position_terms
-    
-    # Filter mappings based on statement_type - with null safety
-    filtered_mappings = {}
-    
-    # Ensure statement_type is not None before calling lower()
-    statement_type = statement_type or "all"
-    
-    if statement_type.lower() in ["all", "income", "profit", "loss"]:
-        for field, keywords in income_mappings.items():
-            filtered_mappings[f"income.{field}"] = keywords
-    
-    if statement_type.lower() in ["all", "position", "balance", "financial_position"]:
-        for field, keywords in position_mappings.items():
-            filtered_mappings[f"position.{field}"] = keywords
-    
-    # If no valid statement type provided, use all mappings
-    if not filtered_mappings:
-        for field, keywords in income_mappings.items():
-            filtered_mappings[f"income.{field}"] = keywords
-        for field, keywords in position_mappings.items():
-            filtered_mappings[f"position.{field}"] = keywords
-    
+    # Select the prebuilt rows for the requested statement type; anything
+    # unrecognized falls back to all mappings
+    if statement_type in ("income", "profit", "loss"):
+        items = deps.income_items
+    elif statement_type in ("position", "balance", "financial_position"):
+        items = deps.position_items
+    else:
+        items = deps.all_items
+
     # Find matches
     matches = {}
-    for full_field, keywords in filtered_mappings.items():
+    for full_field, keywords in items:
         score = 0
         for keyword in keywords:
             if keyword in term_lower:
@@ -89,23 +66,23 @@ def match_financial_term(context: RunContext[FinancialTermDeps], term: str, stat
             "statement_type": "income_statement" if statement_type == "income" else "financial_position",
             "field": field_name,
             "match_score": best_match[1],
-            "matched_term": term
+            "matched_term": term_lower
         }
     
     # No matches found - make a best guess based on the term
     if any(word in term_lower for word in ["revenue", "income", "sale", "expense", "cost", "profit", "loss", "tax"]):
         return {
             "statement_type": "income_statement",
-            "field": term,
+            "field": term_lower,
             "match_score": 0,
-            "matched_term": term
+            "matched_term": term_lower
         }
     elif any(word in term_lower for word in ["asset", "liability", "equity", "cash", "receivable", "payable", "property", "equipment"]):
         return {
             "statement_type": "financial_position", 
-            "field": term,
+            "field": term_lower,
             "match_score": 0,
-            "matched_term": term
+            "matched_term": term_lower
         }
     
     # Truly unknown
@@ -113,9 +90,49 @@ def match_financial_term(context: RunContext[FinancialTermDeps], term: str, stat
         "statement_type": "unknown",
         "field": "unknown",
         "match_score": 0,
-        "matched_term": term
+        "matched_term": term_lower
     }
 
+@functools.lru_cache(maxsize=4096)
+def _match_financial_term_cached(term_lower: str, statement_type: str) -> Dict[str, Any]:
+    """
+    Cached matcher over the module-level financial_deps. The same canonical
+    terms ("Revenue", "Total assets", ...) recur across and within filings,
+    so repeat lookups become near-free. Safe because financial_deps is
+    immutable for the lifetime of the process.
+    """
+    return _match_term_impl(financial_deps, term_lower, statement_type)
+
+def match_financial_term(context: RunContext[FinancialTermDeps], term: str, statement_type: str = "all") -> Dict[str, Any]:
+    """
+    Match a financial term to the standardized field name in financial statements.
+    Uses injected financial term mappings from dependencies.
+
+    Args:
+        context: The tool context with injected dependencies
+        term: The financial term to match (e.g., "Revenue", "Staff Costs", "Cash and bank", etc.)
+        statement_type: Type of statement to match against ("income", "position", "all")
+
+    Returns:
+        Dictionary with matching field name, statement type, and confidence level
+    """
+    # Normalize the cache key - ensure statement_type is not None before lower()
+    statement_type = (statement_type or "all").lower()
+    term_lower = term.lower().strip()
+
+    deps = context.deps
+    if deps is financial_deps:
+        result = dict(_match_financial_term_cached(term_lower, statement_type))
+    else:
+        result = _match_term_impl(deps, term_lower, statement_type)
+
+    # Report the caller's original term, not the normalized cache key
+    result["matched_term"] = term
+    if result["match_score"] == 0 and result["field"] != "unknown":
+        result["field"] = term
+
+    return result
+
 def extract_and_categorize_financial_data(context: RunContext[ExtractContext], data: Union[Dict[str, Any], FinancialData], field_path: str = "") -> Dict[str, Dict[str, float]]:
     """
     Extract and categorize financial values from nested structures, organizing them into appropriate statement models.
@@ -224,5 +241,21 @@ def extract_and_categorize_financial_data(context: RunContext[ExtractContext], d
     for statement_type in list(results.keys()):
         if not results[statement_type]:
             del results[statement_type]
-    
+
     return results
+
+async def match_financial_term_async(context: RunContext[FinancialTermDeps], term: str, statement_type: str = "all") -> Dict[str, Any]:
+    """
+    Async pair of match_financial_term.
+    Offloads the keyword scan to a worker thread so the event loop keeps
+    serving other agent calls while the match runs.
+    """
+    return await asyncio.to_thread(match_financial_term, context, term, statement_type)
+
+async def extract_and_categorize_financial_data_async(context: RunContext[ExtractContext], data: Union[Dict[str, Any], FinancialData], field_path: str = "") -> Dict[str, Dict[str, float]]:
+    """
+    Async pair of extract_and_categorize_financial_data.
+    Offloads the recursive structure walk to a worker thread so concurrent
+    filings keep progressing while one is mid-extraction.
+    """
+    return await asyncio.to_thread(extract_and_categorize_financial_data, context, data, field_path)
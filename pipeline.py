@@ -0,0 +1,127 @@
+"""
+Streaming mapping-to-tagging pipeline.
+
+The blocking flow in api.py waits for the whole mapping run before the
+tagging agent sees anything. Here the mapping agent streams its partial
+PartialXBRL output through an asyncio.Queue bridge, and tagging starts on
+each section as soon as it stops changing between partials - so tagging
+proceeds in parallel with continued mapping token generation. Callers that
+don't want streaming keep using the plain run path.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from mapping.agent import financial_statement_agent, financial_deps
+from mapping.ratelimit import call_with_backoff
+from tagging.agent import xbrl_tagging_agent
+from tagging.dependencies import sg_xbrl_deps
+
+logger = logging.getLogger(__name__)
+
+# Sentinel marking the end of the partial-result stream
+_STREAM_DONE = object()
+
+def _model_sections(partial: Any) -> Dict[str, Any]:
+    """Extract the section dictionaries from a (partial) mapping result"""
+    if hasattr(partial, 'model_dump'):  # Pydantic v2
+        data = partial.model_dump()
+    elif hasattr(partial, 'dict'):      # Pydantic v1
+        data = partial.dict()
+    else:
+        # Fallback to manual conversion
+        data = {k: v for k, v in partial.__dict__.items() if not k.startswith('_')}
+    return {name: section for name, section in data.items() if isinstance(section, dict)}
+
+async def stream_mapping_to_queue(prompt: str, queue: "asyncio.Queue", deps=financial_deps) -> None:
+    """
+    Stream partial mapping results into a queue, ending with a sentinel.
+
+    Args:
+        prompt: Mapping prompt for the financial statement
+        queue: Queue the consumer reads partial results from
+        deps: Dependencies passed to the mapping agent
+    """
+    try:
+        async with financial_statement_agent.run_stream(prompt, deps=deps) as run:
+            async for partial in run.stream():
+                await queue.put(partial)
+    finally:
+        await queue.put(_STREAM_DONE)
+
+async def _tag_section(section_name: str, section_data: Dict[str, Any]) -> Any:
+    """Tag a single mapped section through the tagging agent"""
+    section_json = json.dumps({section_name: section_data}, indent=4)
+    return await call_with_backoff(
+        xbrl_tagging_agent.run,
+        f'Please apply appropriate XBRL tags to this financial data: {section_json}',
+        deps=sg_xbrl_deps
+    )
+
+async def map_and_tag_streaming(data: Dict[str, Any]) -> Tuple[Optional[Any], Dict[str, Any]]:
+    """
+    Map a financial statement and tag its sections as they become ready.
+
+    A section counts as ready once it is non-empty and unchanged between two
+    consecutive partial results; its tagging task is launched immediately
+    instead of waiting for the full mapping run to finish.
+
+    Args:
+        data: Raw financial statement data
+
+    Returns:
+        Tuple of (final mapping result, dict of section name to tagging
+        result); failed section tags are returned as exception instances
+    """
+    data_json = json.dumps(data, indent=4)
+    queue: "asyncio.Queue" = asyncio.Queue()
+    producer = asyncio.create_task(stream_mapping_to_queue(
+        f'Please map this financial statement data: {data_json}', queue
+    ))
+
+    final_mapped = None
+    prev_sections: Dict[str, Any] = {}
+    tagging_tasks: Dict[str, "asyncio.Task"] = {}
+
+    try:
+        while True:
+            partial = await queue.get()
+            if partial is _STREAM_DONE:
+                break
+            final_mapped = partial
+            sections = _model_sections(partial)
+            for section_name, section_data in sections.items():
+                if section_name in tagging_tasks or not section_data:
+                    continue
+                if prev_sections.get(section_name) == section_data:
+                    logger.info(f"Section {section_name} stabilized, starting tagging early")
+                    tagging_tasks[section_name] = asyncio.create_task(
+                        _tag_section(section_name, section_data)
+                    )
+            prev_sections = sections
+
+        await producer
+    except BaseException:
+        # Don't leak in-flight LLM calls when the mapping stream fails:
+        # cancel everything already started and wait for it to settle
+        # before propagating the error
+        producer.cancel()
+        for task in tagging_tasks.values():
+            task.cancel()
+        await asyncio.gather(producer, *tagging_tasks.values(), return_exceptions=True)
+        raise
+
+    # Tag whatever sections never stabilized mid-stream from the final result
+    if final_mapped is not None:
+        for section_name, section_data in _model_sections(final_mapped).items():
+            if section_data and section_name not in tagging_tasks:
+                tagging_tasks[section_name] = asyncio.create_task(
+                    _tag_section(section_name, section_data)
+                )
+
+    section_names = list(tagging_tasks.keys())
+    results = await asyncio.gather(
+        *(tagging_tasks[name] for name in section_names), return_exceptions=True
+    )
+    return final_mapped, dict(zip(section_names, results))
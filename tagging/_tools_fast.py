@@ -0,0 +1,117 @@
+"""
+Hot-loop helpers for the tagging tools.
+
+These functions carry the CPU-bound dict walking that dominates the
+non-LLM time per filing. They are deliberately self-contained, operate
+only on plain dicts of primitives, and avoid per-element exception setup
+and attribute chasing, so a compiled build of this module (Cython/mypyc)
+can be dropped in behind the same interface with no ser/deser overhead.
+"""
+from typing import Any, Callable, Dict, List, Optional, Set
+
+def tag_simple_elements(
+    simple_elements: Dict[str, Any],
+    statement_type: str,
+    field_tag_dicts: Dict[str, List[dict]],
+    field_tag_dicts_lower: Dict[str, List[dict]],
+    find_similar_field: Callable[[str], Optional[str]],
+    mandatory_fields: Dict[str, bool],
+    tags_cache: Dict[str, dict]
+) -> Dict[str, dict]:
+    """
+    Tag every simple (non-nested) element of a section in one tight pass.
+
+    Args:
+        simple_elements: Mapping of element name to scalar value
+        statement_type: Statement type used for the cache key
+        field_tag_dicts: Cached tag dicts keyed by field name
+        field_tag_dicts_lower: Cached tag dicts keyed by lowercase field name
+        find_similar_field: Fuzzy matcher returning a lowercase field name
+        mandatory_fields: Mapping of field name to mandatory flag
+        tags_cache: Cross-call cache of {tags, is_mandatory} entries
+
+    Returns:
+        Mapping of element name to its tagged entry
+    """
+    tagged: Dict[str, dict] = {}
+    cache_get = tags_cache.get
+    tags_get = field_tag_dicts.get
+    mandatory_get = mandatory_fields.get
+
+    for element_name, element_value in simple_elements.items():
+        # Skip processing of None values
+        if element_value is None:
+            continue
+
+        cache_key = f"{element_name}:{statement_type}"
+        cached = cache_get(cache_key)
+        if cached is not None:
+            cached_tags = cached.get("tags", [])
+            tagged[element_name] = {
+                "value": element_value,
+                "tags": cached_tags,
+                "is_mandatory": cached.get("is_mandatory", False),
+                "_has_tags": bool(cached_tags)
+            }
+            continue
+
+        tag_dicts = tags_get(element_name)
+        if tag_dicts is None:
+            similar_lower = find_similar_field(element_name.lower())
+            tag_dicts = field_tag_dicts_lower[similar_lower] if similar_lower is not None else []
+
+        is_mandatory = bool(mandatory_get(element_name, False))
+        tagged[element_name] = {
+            "value": element_value,
+            "tags": tag_dicts,
+            "is_mandatory": is_mandatory,
+            "_has_tags": bool(tag_dicts)
+        }
+        tags_cache[cache_key] = {"tags": tag_dicts, "is_mandatory": is_mandatory}
+
+    return tagged
+
+def validate_tags(tagged_data: Dict[str, Any], required: Set[str]) -> List[Dict[str, str]]:
+    """
+    Scan tagged data for missing mandatory fields and untagged elements.
+
+    Args:
+        tagged_data: Complete set of tagged financial data
+        required: Names of the mandatory fields
+
+    Returns:
+        List of validation issue dictionaries
+    """
+    # One pass collects present fields and untagged elements together;
+    # missing-mandatory errors are reported ahead of the tag warnings
+    present: Set[str] = set()
+    warnings: List[Dict[str, str]] = []
+    for section_name, section_data in tagged_data.items():
+        if not isinstance(section_data, dict):
+            continue
+        present.update(section_data.keys())
+        for field_name, field_data in section_data.items():
+            if not isinstance(field_data, dict) or "tags" not in field_data:
+                continue
+            if field_data.get("_has_tags", bool(field_data["tags"])):
+                continue
+            warnings.append({
+                "severity": "warning",
+                "type": "missing_tags",
+                "section": section_name,
+                "field": field_name,
+                "message": f"No tags applied to field '{field_name}' in section '{section_name}'"
+            })
+
+    issues: List[Dict[str, str]] = [
+        {
+            "severity": "error",
+            "type": "missing_mandatory_field",
+            "field": field_name,
+            "message": f"Mandatory field '{field_name}' is missing from the tagged data"
+        }
+        for field_name in sorted(required - present)
+    ]
+    issues.extend(warnings)
+
+    return issues
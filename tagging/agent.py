@@ -2,39 +2,96 @@
 Agent for XBRL tagging operations.
 """
 
-from pydantic_ai import Agent, Tool
+from typing import Any, List
+from pydantic_ai import Agent, RunContext, Tool
 from pydantic_ai.models.openai import OpenAIModel
-import os
+import asyncio
+
+from core.openai_client import get_async_openai_client
+from mapping.ratelimit import call_with_backoff
 
 from .models import PartialXBRLWithTags
-from .system_prompts import XBRL_DATA_TAGGING_PROMPT
-from .dependencies import XBRLTaxonomyDependencies
+from .system_prompts import XBRL_TAGGING_SYSTEM_STATIC
+from .dependencies import XBRLTaxonomyDependencies, sg_xbrl_deps
 
 # Import the enhanced tools
 from .tools import (
     apply_tags_to_element,
     tag_statement_section,
-    create_context_info, 
-    # validate_tagged_data,
+    create_context_info,
+    validate_tagged_data,
     batch_tag_elements
 )
 
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
-
-tagging_model = OpenAIModel(model_name="gpt-4o", api_key=OPENAI_API_KEY)
+# Initialize the OpenAI model on the process-wide shared client so both
+# agents draw from one high-limit connection pool
+tagging_model = OpenAIModel("gpt-4o", openai_client=get_async_openai_client())
 
-# Define the agent with dependencies and register tools
+# Define the agent with dependencies and register tools. Only the strictly
+# immutable static block goes into system_prompt so every call shares the
+# same cacheable prefix; per-entity context is injected as a second, dynamic
+# system message below.
 xbrl_tagging_agent = Agent(
     model=tagging_model,
     result_type=PartialXBRLWithTags,
-    system_prompt=XBRL_DATA_TAGGING_PROMPT,
+    system_prompt=XBRL_TAGGING_SYSTEM_STATIC,
     deps_type=XBRLTaxonomyDependencies,
     retries=10,
     tools=[
         Tool(apply_tags_to_element, takes_ctx=True),
         Tool(tag_statement_section, takes_ctx=True),
         Tool(create_context_info, takes_ctx=True),
-        # Tool(validate_tagged_data, takes_ctx=True),
+        Tool(validate_tagged_data, takes_ctx=True),
         Tool(batch_tag_elements, takes_ctx=True)
     ]
-)
\ No newline at end of file
+)
+
+@xbrl_tagging_agent.system_prompt
+def entity_context(context: RunContext[XBRLTaxonomyDependencies]) -> str:
+    """Per-entity metadata, kept out of the static (cacheable) prompt prefix"""
+    return (
+        f"Reporting entity: {context.deps.entity_name}. "
+        f"Taxonomy: {context.deps.taxonomy_name}."
+    )
+
+async def run_batch_async(inputs: List[str], *, max_concurrency: int = 32) -> List[Any]:
+    """
+    Run the tagging agent over many inputs concurrently.
+
+    Tagging calls spend almost all their time waiting on the OpenAI API,
+    so bounded asyncio.gather fan-out scales throughput close to linearly
+    with max_concurrency for multi-document pipelines.
+
+    Args:
+        inputs: List of prompt strings, one per mapped financial statement
+        max_concurrency: Maximum number of in-flight agent calls
+
+    Returns:
+        List of agent results in input order; failed calls are returned
+        as exception instances instead of raising
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(prompt: str):
+        async with semaphore:
+            # Paced by the token bucket shared with the mapping agent so
+            # both pipelines stay under the same tier RPM together
+            return await call_with_backoff(
+                xbrl_tagging_agent.run, prompt, deps=sg_xbrl_deps
+            )
+
+    tasks = [_bounded(prompt) for prompt in inputs]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+def run_batch(inputs: List[str], *, max_concurrency: int = 32) -> List[Any]:
+    """
+    Synchronous wrapper around run_batch_async for scripts and notebooks.
+
+    Args:
+        inputs: List of prompt strings, one per mapped financial statement
+        max_concurrency: Maximum number of in-flight agent calls
+
+    Returns:
+        List of agent results in input order
+    """
+    return asyncio.run(run_batch_async(inputs, max_concurrency=max_concurrency))
\ No newline at end of file
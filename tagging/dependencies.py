@@ -1,10 +1,14 @@
 """
 Dependencies for XBRL tagging operations.
 """
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
 from .models import FinancialTag
 
+def _trigrams(text: str) -> Set[str]:
+    """Slide a 3-char window over the text to build its trigram set"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
 # Tagging Dependencies
 @dataclass
 class XBRLTaxonomyDependencies:
@@ -16,6 +20,99 @@ class XBRLTaxonomyDependencies:
     statement_tags: List[FinancialTag]
     reporting_year: Optional[str] = None # Set to None since we're not using it currently
 
+    # Derived lookup tables, built once at construction so the tagging tools
+    # don't re-lower every field name on every call
+    lower_to_field_name: Dict[str, str] = field(init=False, default_factory=dict)
+    mandatory_fields_lower: Dict[str, bool] = field(init=False, default_factory=dict)
+    trigram_index: Dict[str, Set[str]] = field(init=False, default_factory=dict)
+    name_trigrams: Dict[str, Set[str]] = field(init=False, default_factory=dict)
+    field_tag_dicts: Dict[str, List[dict]] = field(init=False, default_factory=dict)
+    field_tag_dicts_lower: Dict[str, List[dict]] = field(init=False, default_factory=dict)
+    statement_tag_dicts: List[dict] = field(init=False, default_factory=list)
+    statement_tag_names_lower: List[str] = field(init=False, default_factory=list)
+    _section_meta_tags: Dict[str, List[dict]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self):
+        """Precompute lowercase lookup tables for case-insensitive matching"""
+        for name in self.field_tags:
+            self.lower_to_field_name[name.lower()] = name
+        self.mandatory_fields_lower = {
+            name.lower(): is_mandatory for name, is_mandatory in self.mandatory_fields.items()
+        }
+        # Inverted trigram index so fuzzy lookups only touch fields sharing
+        # at least one trigram with the query, instead of scanning everything
+        for name_lower in self.lower_to_field_name:
+            grams = _trigrams(name_lower)
+            self.name_trigrams[name_lower] = grams
+            for gram in grams:
+                self.trigram_index.setdefault(gram, set()).add(name_lower)
+        # The taxonomy is immutable for the lifetime of a run, so serialize
+        # each tag exactly once instead of per tool call
+        for name, tags in self.field_tags.items():
+            tag_dicts = [tag.model_dump(mode="json") for tag in tags]
+            self.field_tag_dicts[name] = tag_dicts
+            self.field_tag_dicts_lower[name.lower()] = tag_dicts
+        self.statement_tag_dicts = [tag.model_dump(mode="json") for tag in self.statement_tags]
+        self.statement_tag_names_lower = [tag.element_name.lower() for tag in self.statement_tags]
+
+    def get_section_meta_tags(self, section_name: str) -> List[dict]:
+        """
+        Look up the section-level abstract tag dicts for a section name.
+
+        The substring scan over statement tags runs once per distinct section
+        name and is memoized, so repeat sections (the common case across
+        filings) resolve in O(1).
+
+        Args:
+            section_name: Name of the section (e.g. "filingInformation")
+
+        Returns:
+            List of cached tag dicts whose element name contains the section name
+        """
+        key = (section_name or "").lower()
+        cached = self._section_meta_tags.get(key)
+        if cached is None:
+            cached = [
+                tag_dict
+                for name_lower, tag_dict in zip(self.statement_tag_names_lower, self.statement_tag_dicts)
+                if key in name_lower
+            ]
+            self._section_meta_tags[key] = cached
+        return cached
+
+    def find_similar_field(self, query_lower: str, min_similarity: float = 0.3) -> Optional[str]:
+        """
+        Find the closest field name to the query using trigram Jaccard similarity.
+
+        Args:
+            query_lower: Lowercased element name to match
+            min_similarity: Minimum Jaccard score for a match to count
+
+        Returns:
+            The lowercase field name of the best candidate, or None if no
+            candidate clears the similarity threshold
+        """
+        query_grams = _trigrams(query_lower)
+        if not query_grams:
+            return None
+
+        # Union the postings lists to get the candidate set
+        candidates: Set[str] = set()
+        for gram in query_grams:
+            candidates.update(self.trigram_index.get(gram, ()))
+
+        best_name = None
+        best_score = min_similarity
+        for name_lower in candidates:
+            name_grams = self.name_trigrams[name_lower]
+            overlap = len(query_grams & name_grams)
+            score = overlap / (len(query_grams) + len(name_grams) - overlap)
+            if score > best_score:
+                best_score = score
+                best_name = name_lower
+
+        return best_name
+
 # Filing information XBRL taxonomy tags
 
 SG_XBRL_FILING_TAGS = {
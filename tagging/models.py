@@ -1,12 +1,16 @@
 """
 Models for XBRL tagging operations.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, List, Optional
 
 
 class FinancialTag(BaseModel):
     """Model for a single financial tag with standard XBRL attributes from Singapore ACRA taxonomy"""
+    # Frozen so tag instances are hashable and safe to use as cache keys;
+    # the taxonomy is immutable for the lifetime of a run anyway
+    model_config = ConfigDict(frozen=True)
+
     prefix: str = Field("sg-as", description="Taxonomy prefix (e.g., 'sg-as' for Singapore Account Standards)")
     element_name: str = Field(..., description="Official element name in the taxonomy (e.g., 'Revenue')")
     element_id: str = Field(..., description="Full element ID including prefix (e.g., 'sg-as_Revenue')")
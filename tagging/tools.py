@@ -7,14 +7,17 @@ import logging
 # Add a logger at the top of the file 
 logger = logging.getLogger(__name__)
 
-from typing import Dict, Any, List, Union, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import date
+import asyncio
+import functools
 import time
 import re
 from pydantic import BaseModel, Field
 from pydantic_ai import RunContext
 
 from .dependencies import XBRLTaxonomyDependencies
+from ._tools_fast import tag_simple_elements, validate_tags
 
 # Tags cache to avoid redundant lookups
 _tags_cache = {}
@@ -47,39 +50,46 @@ def apply_tags_to_element(
         cached_result["value"] = value  # Update with current value
         return cached_result
     
-    tags = []
+    tag_dicts = []
     messages = []
     start_time = time.time()
-    
-    # Find tags for the element name
-    if element_name in context.deps.field_tags:
-        tags = context.deps.field_tags[element_name]
+
+    # Find cached tag dicts for the element name - serialization happened
+    # once at dependency-load time
+    if element_name in context.deps.field_tag_dicts:
+        tag_dicts = context.deps.field_tag_dicts[element_name]
         messages.append(f"Found exact tag match for {element_name}")
     else:
-        messages.append(f"No exact tag match found for {element_name}")
-        # Try finding similar tags for fuzzy matching - optimized version
         element_lower = element_name.lower()
-        
-        # First try direct substring matches (faster)
-        for field_name, field_tags in context.deps.field_tags.items():
-            field_lower = field_name.lower()
-            if element_lower in field_lower or field_lower in element_lower:
-                tags = field_tags
-                messages.append(f"Using similar tag: {field_name}")
-                break
+
+        # Case-insensitive exact match via the precomputed lookup table - O(1)
+        if element_lower in context.deps.field_tag_dicts_lower:
+            tag_dicts = context.deps.field_tag_dicts_lower[element_lower]
+            messages.append(f"Using similar tag: {context.deps.lower_to_field_name[element_lower]}")
+        else:
+            messages.append(f"No exact tag match found for {element_name}")
+            # Fuzzy match via the trigram inverted index - only candidates
+            # sharing a trigram are scored, and the closest one wins instead
+            # of an arbitrary first substring hit
+            similar_lower = context.deps.find_similar_field(element_lower)
+            if similar_lower is not None:
+                tag_dicts = context.deps.field_tag_dicts_lower[similar_lower]
+                messages.append(f"Using similar tag: {context.deps.lower_to_field_name[similar_lower]}")
     
-    # Check if it's a mandatory field
-    is_mandatory = False
-    if element_name in context.deps.mandatory_fields:
-        is_mandatory = context.deps.mandatory_fields[element_name]
-        if is_mandatory:
-            messages.append(f"Note: {element_name} is a mandatory field")
+    # Check if it's a mandatory field - exact name first, then the
+    # precomputed lowercase table so case differences don't hide the flag
+    is_mandatory = context.deps.mandatory_fields.get(
+        element_name,
+        context.deps.mandatory_fields_lower.get(element_name.lower(), False)
+    )
+    if is_mandatory:
+        messages.append(f"Note: {element_name} is a mandatory field")
     
     # Create response
     result = {
         "element_name": element_name,
         "value": value,
-        "tags": [tag.dict() for tag in tags],  # Convert tags to dict for JSON serialization
+        "tags": tag_dicts,  # Already JSON-ready from the dependency-load cache
         "is_mandatory": is_mandatory,
         "messages": messages,
         "processing_time_ms": (time.time() - start_time) * 1000
@@ -115,21 +125,10 @@ def tag_statement_section(
         start_time = time.time()
         tagged_section = {"meta_tags": []}
         
-        # Find section-level abstract tags
+        # Find section-level abstract tags - memoized per section name on the
+        # dependencies, so repeat sections skip the statement-tag scan entirely
         try:
-            for tag in context.deps.statement_tags:
-                try:
-                    if section_name.lower() in tag.element_name.lower():
-                        # Use safe dictionary conversion
-                        if hasattr(tag, 'dict') and callable(tag.dict):
-                            tagged_section["meta_tags"].append(tag.dict())
-                        else:
-                            # Fallback for objects without dict() method
-                            tag_dict = {k: v for k, v in tag.__dict__.items() if not k.startswith('_')}
-                            tagged_section["meta_tags"].append(tag_dict)
-                except Exception as tag_e:
-                    logger.warning(f"Error processing tag in section {section_name}: {str(tag_e)}")
-                    continue  # Skip problematic tags
+            tagged_section["meta_tags"] = list(context.deps.get_section_meta_tags(section_name))
         except Exception as tags_e:
             logger.warning(f"Error accessing statement_tags: {str(tags_e)}")
             # Continue with empty meta_tags
@@ -183,88 +182,19 @@ def tag_statement_section(
                         logger.warning(f"Error categorizing element {element_name}: {str(e)}")
                         continue
                 
-                # Process simple elements in a single pass
+                # Process simple elements in a single pass - the hot loop
+                # lives in _tools_fast, free of per-element exception setup
+                # and ready to be swapped for a compiled build
                 if simple_elements:
-                    # For each simple element, find tags efficiently
-                    for element_name, element_value in simple_elements.items():
-                        try:
-                            # Skip processing of None values
-                            if element_value is None:
-                                continue
-                                
-                            # Get tags (using cache if possible)
-                            cache_key = f"{element_name}:{statement_type}"
-                            if cache_key in _tags_cache:
-                                # Use cached tags
-                                cached_entry = _tags_cache[cache_key]
-                                tagged_section[element_name] = {
-                                    "value": element_value,
-                                    "tags": cached_entry.get("tags", []),
-                                    "is_mandatory": cached_entry.get("is_mandatory", False)
-                                }
-                            else:
-                                # Find tags for this element
-                                tags = []
-                                try:
-                                    if element_name in context.deps.field_tags:
-                                        tags = context.deps.field_tags[element_name]
-                                    else:
-                                        # Try finding similar tags
-                                        element_lower = element_name.lower()
-                                        for field_name, field_tags in context.deps.field_tags.items():
-                                            try:
-                                                field_lower = field_name.lower()
-                                                if element_lower in field_lower or field_lower in element_lower:
-                                                    tags = field_tags
-                                                    break
-                                            except Exception:
-                                                continue
-                                except Exception as tags_e:
-                                    logger.warning(f"Error finding tags for {element_name}: {str(tags_e)}")
-                                
-                                # Convert tags to dict safely
-                                tag_dicts = []
-                                for tag in tags:
-                                    try:
-                                        if hasattr(tag, 'dict') and callable(tag.dict):
-                                            tag_dicts.append(tag.dict())
-                                        else:
-                                            # Fallback for objects without dict() method
-                                            tag_dict = {k: v for k, v in tag.__dict__.items() 
-                                                      if not k.startswith('_')}
-                                            tag_dicts.append(tag_dict)
-                                    except Exception:
-                                        continue
-                                
-                                # Store in result and cache
-                                is_mandatory = False
-                                try:
-                                    is_mandatory = element_name in context.deps.mandatory_fields and context.deps.mandatory_fields[element_name]
-                                except Exception:
-                                    pass
-                                
-                                tagged_section[element_name] = {
-                                    "value": element_value,
-                                    "tags": tag_dicts,
-                                    "is_mandatory": is_mandatory
-                                }
-                                
-                                # Add to cache
-                                try:
-                                    _tags_cache[cache_key] = {
-                                        "tags": tag_dicts,
-                                        "is_mandatory": is_mandatory
-                                    }
-                                except Exception as cache_e:
-                                    logger.warning(f"Error caching tags for {element_name}: {str(cache_e)}")
-                        except Exception as elem_e:
-                            logger.warning(f"Error processing element {element_name}: {str(elem_e)}")
-                            # Add minimal entry for this element to avoid breaking the output
-                            tagged_section[element_name] = {
-                                "value": element_value,
-                                "tags": [],
-                                "processing_error": str(elem_e)
-                            }
+                    tagged_section.update(tag_simple_elements(
+                        simple_elements,
+                        statement_type,
+                        context.deps.field_tag_dicts,
+                        context.deps.field_tag_dicts_lower,
+                        context.deps.find_similar_field,
+                        context.deps.mandatory_fields,
+                        _tags_cache
+                    ))
             else:
                 # Original non-batch processing for comparison
                 for element_name, element_value in section_data.items():
@@ -273,30 +203,17 @@ def tag_statement_section(
                         if isinstance(element_value, (list, dict)):
                             continue
                             
-                        # Find matching tags
-                        tags = []
+                        # Find matching cached tag dicts
+                        tag_dicts = []
                         try:
-                            if element_name in context.deps.field_tags:
-                                tags = context.deps.field_tags[element_name]
+                            tag_dicts = context.deps.field_tag_dicts.get(element_name, [])
                         except Exception:
                             pass
-                        
-                        # Convert tags to dict safely
-                        tag_dicts = []
-                        for tag in tags:
-                            try:
-                                if hasattr(tag, 'dict') and callable(tag.dict):
-                                    tag_dicts.append(tag.dict())
-                                else:
-                                    tag_dict = {k: v for k, v in tag.__dict__.items() 
-                                               if not k.startswith('_')}
-                                    tag_dicts.append(tag_dict)
-                            except Exception:
-                                continue
-                        
+
                         tagged_section[element_name] = {
                             "value": element_value,
-                            "tags": tag_dicts
+                            "tags": tag_dicts,
+                            "_has_tags": bool(tag_dicts)
                         }
                     except Exception as elem_e:
                         logger.warning(f"Error in non-batch processing for element {element_name}: {str(elem_e)}")
@@ -334,6 +251,73 @@ def tag_statement_section(
             }
         }
 
+async def tag_statement_section_async(
+    context: RunContext[XBRLTaxonomyDependencies],
+    section_name: str,
+    section_data: Dict[str, Any],
+    use_batch_processing: bool = True
+) -> Dict[str, Any]:
+    """
+    Async pair of tag_statement_section.
+    Runs the pure-Python tagging work in a worker thread so the event loop
+    keeps serving concurrent LLM calls while a section is being tagged.
+    """
+    return await asyncio.to_thread(
+        tag_statement_section, context, section_name, section_data, use_batch_processing
+    )
+
+async def tag_all_sections(
+    context: RunContext[XBRLTaxonomyDependencies],
+    sections: Dict[str, Dict[str, Any]],
+    max_concurrency: int = 8
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Tag every section of a statement concurrently.
+
+    Sections (filingInformation, statementOfFinancialPosition, etc.) are
+    independent, so fanning out brings full-statement latency down to the
+    slowest section instead of the sum of all sections.
+
+    Args:
+        context: Runtime context containing taxonomy dependencies
+        sections: Mapping of section name to section data
+        max_concurrency: Maximum number of sections tagged at once
+
+    Returns:
+        Dictionary mapping each section name to its tagged section
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(section_name: str, section_data: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await tag_statement_section_async(context, section_name, section_data)
+
+    section_names = list(sections.keys())
+    results = await asyncio.gather(
+        *(_bounded(name, sections[name]) for name in section_names)
+    )
+    return dict(zip(section_names, results))
+
+@functools.lru_cache(maxsize=256)
+def _context_id(period_end_iso: str, period_start_iso: Optional[str],
+                is_consolidated: bool, dims_tuple: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Build a context ID from normalized (hashable) parameters.
+    A full statement reuses the same handful of periods dozens of times, so
+    the lru_cache makes repeat IDs free; the compact YYYYMMDD form comes from
+    stripping the ISO date's dashes, avoiding strftime entirely.
+    """
+    end_compact = period_end_iso.replace("-", "")
+    period_part = f"i{end_compact}" if period_start_iso is None else \
+                  f"d{period_start_iso.replace('-', '')}to{end_compact}"
+
+    context_id = f"ctx_{period_part}_{'c' if is_consolidated else 's'}"
+
+    if dims_tuple:
+        context_id = f"{context_id}_{'_'.join(f'{name}-{value}' for name, value in dims_tuple)}"
+
+    return context_id
+
 # Update the create_context_info tool - this is still useful for creating proper XBRL contexts
 def create_context_info(
     context: RunContext[XBRLTaxonomyDependencies],
@@ -359,20 +343,17 @@ def create_context_info(
     Returns:
         Dictionary containing context information
     """
-    # Create a unique context ID based on parameters
-    period_part = f"i{period_end.strftime('%Y%m%d')}" if period_start is None else \
-                  f"d{period_start.strftime('%Y%m%d')}to{period_end.strftime('%Y%m%d')}"
-    
-    context_id = f"ctx_{period_part}_{'c' if is_consolidated else 's'}"
-    
-    # Add dimension information if provided
-    if dimensions:
-        dim_parts = []
-        for dim_name, dim_value in sorted(dimensions.items()):
-            dim_parts.append(f"{dim_name}-{dim_value}")
-        if dim_parts:
-            context_id = f"{context_id}_{'_'.join(dim_parts)}"
-    
+    # Create a unique context ID based on parameters - cached, since the
+    # same periods/dimensions recur across a statement
+    period_end_iso = period_end.isoformat()
+    period_start_iso = period_start.isoformat() if period_start is not None else None
+    context_id = _context_id(
+        period_end_iso,
+        period_start_iso,
+        is_consolidated,
+        tuple(sorted((dimensions or {}).items()))
+    )
+
     # Create context object
     context_info = {
         "id": context_id,
@@ -381,75 +362,60 @@ def create_context_info(
             "identifier": entity_identifier
         },
         "period": {
-            "end_date": period_end.isoformat()
+            "end_date": period_end_iso
         },
         "is_consolidated": is_consolidated
     }
-    
-    if period_start is not None:
-        context_info["period"]["start_date"] = period_start.isoformat()
+
+    if period_start_iso is not None:
+        context_info["period"]["start_date"] = period_start_iso
     
     if dimensions:
         context_info["dimensions"] = dimensions
     
     return context_info
 
-# # Enhanced validation tool
-# def validate_tagged_data(
-#     context: RunContext[XBRLTaxonomyDependencies],
-#     tagged_data: Dict[str, Any]
-# ) -> List[Dict[str, str]]:
-#     """
-#     Validate the tagged data for completeness and correctness
-    
-#     Args:
-#         context: Runtime context containing taxonomy dependencies
-#         tagged_data: Complete set of tagged financial data
-        
-#     Returns:
-#         List of validation issues found
-#     """
-#     start_time = time.time()
-#     issues = []
-    
-#     # Check for missing mandatory fields
-#     for field_name, is_mandatory in context.deps.mandatory_fields.items():
-#         if is_mandatory:
-#             field_found = False
-            
-#             # Search through all sections for the field
-#             for section_name, section_data in tagged_data.items():
-#                 if isinstance(section_data, dict) and field_name in section_data:
-#                     field_found = True
-#                     break
-            
-#             if not field_found:
-#                 issues.append({
-#                     "severity": "error",
-#                     "type": "missing_mandatory_field",
-#                     "field": field_name,
-#                     "message": f"Mandatory field '{field_name}' is missing from the tagged data"
-#                 })
-    
-#     # Check for fields without tags
-#     for section_name, section_data in tagged_data.items():
-#         if isinstance(section_data, dict):
-#             for field_name, field_data in section_data.items():
-#                 if isinstance(field_data, dict) and "tags" in field_data and not field_data["tags"]:
-#                     issues.append({
-#                         "severity": "warning",
-#                         "type": "missing_tags",
-#                         "section": section_name,
-#                         "field": field_name,
-#                         "message": f"No tags applied to field '{field_name}' in section '{section_name}'"
-#                     })
-    
-#     # Return issues with performance data
-#     return {
-#         "issues": issues,
-#         "issue_count": len(issues),
-#         "validation_time_ms": (time.time() - start_time) * 1000
-#     }
+# Enhanced validation tool
+def validate_tagged_data(
+    context: RunContext[XBRLTaxonomyDependencies],
+    tagged_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Validate the tagged data for completeness and correctness
+
+    Args:
+        context: Runtime context containing taxonomy dependencies
+        tagged_data: Complete set of tagged financial data
+
+    Returns:
+        Dictionary with the list of validation issues found
+    """
+    start_time = time.time()
+
+    # The scan itself lives in _tools_fast: one pass collects present field
+    # names and untagged elements, then a set difference against the
+    # mandatory set yields the missing-field errors
+    required = {field_name for field_name, is_mandatory in context.deps.mandatory_fields.items() if is_mandatory}
+    issues = validate_tags(tagged_data, required)
+
+    # Return issues with performance data
+    return {
+        "issues": issues,
+        "issue_count": len(issues),
+        "validation_time_ms": (time.time() - start_time) * 1000
+    }
+
+async def validate_tagged_data_async(
+    context: RunContext[XBRLTaxonomyDependencies],
+    tagged_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Async pair of validate_tagged_data.
+    Walking a large tagged_data dict blocks the loop for tens of
+    milliseconds, starving concurrent LLM coroutines under run_batch_async;
+    offloading to a worker thread restores true interleaving.
+    """
+    return await asyncio.to_thread(validate_tagged_data, context, tagged_data)
 
 # New batch processing helper for the existing apply_tags_to_element function
 def batch_tag_elements(